@@ -1,79 +1,571 @@
 import asyncio
+import functools
+import importlib.util
+import logging
 import os
+import socket
+import struct
+import sys
+import textwrap
+import time
+import types
 from contextlib import asynccontextmanager
-from typing import List, Union, Optional
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Tuple, Union, Optional
 
-from pymodbus.client import AsyncModbusTcpClient, AsyncModbusUdpClient, AsyncModbusSerialClient
-from pymodbus.exceptions import ModbusException
+import anyio
+import numpy as np
+from pymodbus.client import AsyncModbusTcpClient, AsyncModbusUdpClient, AsyncModbusSerialClient, ModbusBaseClient
+from pymodbus.exceptions import ConnectionException, ModbusException
 from mcp.server.fastmcp import FastMCP, Context
 from mcp.server.fastmcp.prompts import base
 
 from dotenv import load_dotenv
 
-load_dotenv()
+from modbus_mcp.uring import UringModbusTcpClient, uring_available
 
-# Modbus client configuration from environment variables
-MODBUS_TYPE = os.environ.get("MODBUS_TYPE", "tcp").lower()  # tcp, udp, or serial
-MODBUS_HOST = os.environ.get("MODBUS_HOST", "127.0.0.1")
-MODBUS_PORT = int(os.environ.get("MODBUS_PORT", 502))
-MODBUS_SERIAL_PORT = os.environ.get("MODBUS_SERIAL_PORT", "/dev/ttyUSB0")
-MODBUS_BAUDRATE = int(os.environ.get("MODBUS_BAUDRATE", 9600))
-MODBUS_PARITY = os.environ.get("MODBUS_PARITY", "N")
-MODBUS_STOPBITS = int(os.environ.get("MODBUS_STOPBITS", 1))
-MODBUS_BYTESIZE = int(os.environ.get("MODBUS_BYTESIZE", 8))
-MODBUS_TIMEOUT = float(os.environ.get("MODBUS_TIMEOUT", 1))
-MODBUS_DEFAULT_SLAVE_ID = int(os.environ.get("MODBUS_DEFAULT_SLAVE_ID", 1))
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Modbus client configuration, read once from environment variables."""
+    transport: str  # tcp, tcp+uring, udp, or serial
+    host: str
+    port: int
+    serial_port: str
+    baudrate: int
+    parity: str
+    stopbits: int
+    bytesize: int
+    timeout: float
+    default_slave_id: int
+    batch_max_gap: int
+    max_inflight: int
+    keepalive_interval: float  # 0 disables probing
+    read_cache_ttl: float  # 0 disables the read cache
+    fast_close: bool  # Reset connections instead of closing them cleanly
+    coalesce_window_ms: float  # 0 sends every read_register call on its own
 
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """Parse the MODBUS_* environment variables."""
+        return cls(
+            # Interned so transport comparisons against literals hit the identity fast path
+            transport=sys.intern(os.environ.get("MODBUS_TYPE", "tcp").lower()),
+            host=os.environ.get("MODBUS_HOST", "127.0.0.1"),
+            port=int(os.environ.get("MODBUS_PORT", 502)),
+            serial_port=os.environ.get("MODBUS_SERIAL_PORT", "/dev/ttyUSB0"),
+            baudrate=int(os.environ.get("MODBUS_BAUDRATE", 9600)),
+            parity=os.environ.get("MODBUS_PARITY", "N"),
+            stopbits=int(os.environ.get("MODBUS_STOPBITS", 1)),
+            bytesize=int(os.environ.get("MODBUS_BYTESIZE", 8)),
+            timeout=float(os.environ.get("MODBUS_TIMEOUT", 1)),
+            default_slave_id=int(os.environ.get("MODBUS_DEFAULT_SLAVE_ID", 1)),
+            batch_max_gap=int(os.environ.get("MODBUS_BATCH_MAX_GAP", 8)),
+            max_inflight=int(os.environ.get("MODBUS_MAX_INFLIGHT", 8)),
+            keepalive_interval=float(os.environ.get("MODBUS_KEEPALIVE_INTERVAL", 30)),
+            read_cache_ttl=float(os.environ.get("MODBUS_READ_CACHE_TTL", 0.5)),
+            fast_close=os.environ.get("MODBUS_FAST_CLOSE", "0") == "1",
+            coalesce_window_ms=float(os.environ.get("MODBUS_COALESCE_WINDOW_MS", 2)),
+        )
 
-@asynccontextmanager
-async def get_modbus_client(host: str, port: int, transport: str):
-    """Context manager to create, connect, and close a Modbus client."""
-    client = None
-    if transport == "tcp":
-        client = AsyncModbusTcpClient(host=host, port=port)
-    elif transport == "udp":
-        client = AsyncModbusUdpClient(host=host, port=port)
-    elif transport == "serial":
-        client = AsyncModbusSerialClient(
-            port=MODBUS_SERIAL_PORT, # Using env vars for serial details as they are device specific
-            baudrate=MODBUS_BAUDRATE,
-            parity=MODBUS_PARITY,
-            stopbits=MODBUS_STOPBITS,
-            bytesize=MODBUS_BYTESIZE,
-            timeout=MODBUS_TIMEOUT
+
+@functools.cache
+def get_settings() -> Settings:
+    """Return the settings, reading the environment on first use (after main() loaded .env)."""
+    return Settings.from_env()
+
+# Maximum number of registers a single read request (FC03/FC04) may return
+MAX_READ_REGISTERS = 125
+# Maximum number of registers a single write request (FC16) may carry
+MAX_WRITE_REGISTERS = 123
+# Maximum number of read results kept in the read cache
+READ_CACHE_SIZE = 1024
+# Send and receive buffer size requested for TCP client sockets
+SOCKET_BUFFER_SIZE = 256 * 1024
+# Seconds without reads after which an endpoint's read batching task stops
+COALESCE_IDLE_TIMEOUT = 30
+
+
+
+# Cached Modbus clients, one per (transport, host, port) endpoint; see _client_key() for serial
+_clients: Dict[Tuple[str, str, int], ModbusBaseClient] = {}
+_client_locks: Dict[Tuple[str, str, int], asyncio.Lock] = {}
+# Background tasks probing idle TCP clients so their connections stay open
+_keepalive_tasks: Dict[Tuple[str, str, int], asyncio.Task] = {}
+# Bounds the number of concurrent requests issued to one endpoint
+_client_semaphores: Dict[Tuple[str, str, int], asyncio.Semaphore] = {}
+# Recent read results by (transport, host, port, slave_id, client method, address, count),
+# with the time.monotonic() at which they expire
+_read_cache: Dict[Tuple[str, str, int, int, str, int, int], Tuple[float, Any]] = {}
+# Number of writes completed per endpoint, so reads in flight across a write can tell
+_write_generations: Dict[Tuple[str, str, int], int] = {}
+# Last known holding register values per endpoint, by (slave_id, address), kept by the tools
+_register_cache: Dict[Tuple[str, str, int], Dict[Tuple[int, int], int]] = {}
+
+# Read functions available to read_many: client method, label and result attribute
+_READ_FUNCTIONS = {
+    "holding_registers": ("read_holding_registers", "Holding Registers", "registers"),
+    "input_registers": ("read_input_registers", "Input Registers", "registers"),
+    "coils": ("read_coils", "Coils", "bits"),
+}
+
+
+def _endpoint(host: Optional[str], port: Optional[int], transport: Optional[str]) -> Tuple[str, int, str]:
+    """Fill in connection arguments a tool was called without from the settings."""
+    settings = get_settings()
+    return (
+        settings.host if host is None else host,
+        settings.port if port is None else port,
+        settings.transport if transport is None else sys.intern(transport),
+    )
+
+
+# Source of _endpoint with the default endpoint as constants, compiled by _bind_endpoint_defaults()
+_BOUND_ENDPOINT_SOURCE = """
+    def _endpoint(host, port, transport):
+        \"\"\"Fill in connection arguments a tool was called without from the defaults bound at startup.\"\"\"
+        return (
+            {host!r} if host is None else host,
+            {port!r} if port is None else port,
+            TRANSPORT if transport is None else sys.intern(transport),
         )
-    else:
-        raise ValueError(f"Invalid transport: {transport}. Must be 'tcp', 'udp', or 'serial'.")
+"""
+
+
+def _bind_endpoint_defaults(settings: Settings) -> None:
+    """Replace _endpoint with a version compiled with the settings' endpoint baked in."""
+    global _endpoint
+    source = textwrap.dedent(_BOUND_ENDPOINT_SOURCE).format(host=settings.host, port=settings.port)
+    module = compile(source, "<bound _endpoint>", "exec")
+    code = next(const for const in module.co_consts if isinstance(const, types.CodeType))
+    # The transport stays a global so the interned string is returned
+    _endpoint = types.FunctionType(code, {"sys": sys, "TRANSPORT": settings.transport}, "_endpoint")
+
+
+def _tune_socket(sock: Optional[socket.socket]) -> None:
+    """Disable Nagle and delayed ACKs, enlarge the buffers and enable TCP keepalive on a client's TCP socket."""
+    if sock is None:
+        return
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if hasattr(socket, "TCP_QUICKACK"):  # Linux only
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+        # Room for bursts of batched and concurrent requests to many registers
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        if hasattr(socket, "TCP_KEEPIDLE"):  # Not available on all platforms
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 15)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 5)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 3)
+    except OSError:
+        pass
+
+
+def _tcp_client(host: str, port: int) -> ModbusBaseClient:
+    """Create a Modbus TCP client whose socket is tuned on every connect."""
+    client = AsyncModbusTcpClient(
+        host=host,
+        port=port,
+        # Called on every (re)connect, including pymodbus' automatic reconnects
+        trace_connect=lambda connected: connected and _tune_socket(
+            client.ctx.transport.get_extra_info("socket")),
+    )
+    return client
+
+
+def _uring_client(host: str, port: int) -> ModbusBaseClient:
+    """Create an io_uring Modbus TCP client, or a regular one if io_uring is unavailable."""
+    if not uring_available():
+        # Not Linux, kernel too old, liburing missing or io_uring disabled
+        return _tcp_client(host, port)
+    client = UringModbusTcpClient(
+        host=host,
+        port=port,
+        trace_connect=lambda connected: connected and _tune_socket(client.socket),
+    )
+    return client
+
+
+def _serial_client(host: str, port: int) -> ModbusBaseClient:
+    """Create a Modbus serial client; host and port don't apply to serial lines."""
+    settings = get_settings()
+    return AsyncModbusSerialClient(
+        port=settings.serial_port, # Using env vars for serial details as they are device specific
+        baudrate=settings.baudrate,
+        parity=settings.parity,
+        stopbits=settings.stopbits,
+        bytesize=settings.bytesize,
+        timeout=settings.timeout
+    )
+
+
+# Unconnected client factories, taking (host, port), by transport
+_FACTORIES: Dict[str, Callable[[str, int], ModbusBaseClient]] = {
+    "tcp": _tcp_client,
+    "tcp+uring": _uring_client,
+    "udp": lambda host, port: AsyncModbusUdpClient(host=host, port=port),
+    "serial": _serial_client,
+}
+
+
+async def health_check(client: ModbusBaseClient, host: str, port: int, transport: str) -> None:
+    """Reconnect a cached client if its connection has dropped."""
+    if client.connected:
+        return
+    await client.connect()
+    # Note: pymodbus connect() might not raise exception even if connection fails,
+    # so client.connected is checked explicitly.
+    if not client.connected:
+        raise RuntimeError(f"Failed to connect to Modbus {transport} device at {host}:{port}")
+
+
+async def _keepalive(key: Tuple[str, str, int]) -> None:
+    """Periodically probe a cached client so reconnects happen here rather than in a tool call."""
+    transport, host, port = key
+    while True:
+        await asyncio.sleep(get_settings().keepalive_interval)
+        client = _clients.get(key)
+        if client is None:
+            return
+        try:
+            async with _client_locks[key]:
+                await health_check(client, host, port, transport)
+            await client.read_holding_registers(address=0, count=1, slave=get_settings().default_slave_id)
+        except (ModbusException, RuntimeError):
+            # Exception responses and failed reconnects are fine; the probe only keeps the link warm
+            pass
+
+
+def _close_client(client: ModbusBaseClient) -> None:
+    """Close a client, resetting its connection instead if MODBUS_FAST_CLOSE is set."""
+    if get_settings().fast_close:
+        if isinstance(client, UringModbusTcpClient):
+            client.abort()
+            return
+        transport = client.ctx.transport
+        if transport is not None:
+            sock = transport.get_extra_info("socket")
+            if sock is not None and sock.type == socket.SOCK_STREAM:
+                # Zero linger: the connection ends with a reset instead of a FIN
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+            # Closes without flushing unsent data
+            transport.abort()
+    # Also stops pymodbus' reconnect handling; a no-op on the transport if aborted
+    client.close()
+
+
+def _client_key(host: str, port: int, transport: str) -> Tuple[str, str, int]:
+    """Return the (transport, host, port) key of an endpoint's client; all serial endpoints share the one line."""
+    if transport == "serial":
+        return ("serial", get_settings().serial_port, 0)
+    return (transport, host, port)
+
+
+def _discard_client(key: Tuple[str, str, int]) -> None:
+    """Close a cached client and stop its keepalive task."""
+    client = _clients.pop(key, None)
+    if client is not None:
+        _close_client(client)
+    task = _keepalive_tasks.pop(key, None)
+    if task is not None:
+        task.cancel()
+
+
+async def get_client(host: str, port: int, transport: str) -> ModbusBaseClient:
+    """Return a connected Modbus client for the endpoint, reusing a cached one if possible."""
+    key = _client_key(host, port, transport)
+    lock = _client_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        client = _clients.get(key)
+        if client is None:
+            try:
+                client = _FACTORIES[transport](host, port)
+            except KeyError:
+                raise ValueError(
+                    f"Invalid transport: {transport}. Must be one of {', '.join(map(repr, _FACTORIES))}."
+                ) from None
+            _clients[key] = client
+            if transport in ("tcp", "tcp+uring") and get_settings().keepalive_interval > 0:
+                _keepalive_tasks[key] = asyncio.create_task(_keepalive(key))
+        try:
+            await health_check(client, host, port, transport)
+        except RuntimeError:
+            # Don't keep a dead client (and its reconnect loop) around
+            _discard_client(key)
+            raise
+        return client
+
+
+def decode_registers(regs: List[int], dtype: str, wordswap: bool = False) -> np.ndarray:
+    """
+    Decode big-endian Modbus registers into values of a NumPy dtype such as 'float32' or 'int32'.
+
+    With wordswap, the 16-bit words of each value are taken low word first.
+    """
+    arr = np.asarray(regs, dtype=">u2")
+    value_dtype = np.dtype(dtype)
+    if wordswap:
+        arr = arr.reshape(-1, value_dtype.itemsize // 2)[:, ::-1].ravel()
+    return arr.view(value_dtype.newbyteorder(">"))
+
+
+async def _read(
+    host: str, port: int, transport: str, method: str, slave_id: int, address: int, count: int,
+    fresh: bool = False
+) -> Any:
+    """
+    Perform a read with a client method such as 'read_coils', without contacting the device
+    if the same read succeeded less than MODBUS_READ_CACHE_TTL seconds ago (unless fresh).
+
+    Holding register values read are recorded for write_registers_pipelined's only_changed.
+    Results of reads that overlapped a write to the endpoint are neither cached nor recorded.
+    """
+    key = (*_client_key(host, port, transport), slave_id, method, address, count)
+    now = time.monotonic()
+    cached = _read_cache.get(key)
+    if not fresh and cached is not None and cached[0] > now:
+        return cached[1]
+    generation = _write_generations.get(key[:3], 0)
+    client = await get_client(host, port, transport)
+    result = await getattr(client, method)(address=address, count=count, slave=slave_id)
+    if result.isError() or _write_generations.get(key[:3], 0) != generation:
+        # A write completed meanwhile; the values may predate it
+        return result
+    if method == "read_holding_registers":
+        _remember_registers(host, port, transport, slave_id, address, result.registers)
+    ttl = get_settings().read_cache_ttl
+    if ttl > 0:
+        if len(_read_cache) >= READ_CACHE_SIZE:
+            for stale in [k for k, (expires, _) in _read_cache.items() if expires <= now]:
+                del _read_cache[stale]
+            if len(_read_cache) >= READ_CACHE_SIZE:
+                del _read_cache[next(iter(_read_cache))]  # Oldest entry
+        _read_cache[key] = (now + ttl, result)
+    return result
+
+
+def _invalidate_reads(host: str, port: int, transport: str, method: str, slave_id: int, address: int, count: int) -> None:
+    """Drop cached results of reads with a client method overlapping registers or coils just written."""
+    endpoint = _client_key(host, port, transport)
+    _write_generations[endpoint] = _write_generations.get(endpoint, 0) + 1
+    for key in [k for k in _read_cache if k[:5] == (*endpoint, slave_id, method)
+                and k[5] < address + count and address < k[5] + k[6]]:
+        del _read_cache[key]
+
+
+def _remember_registers(
+    host: str, port: int, transport: str, slave_id: int, address: int, registers: Iterable[int]
+) -> None:
+    """Record holding register values read from or written to a device."""
+    cache = _register_cache.setdefault(_client_key(host, port, transport), {})
+    for offset, value in enumerate(registers):
+        cache[(slave_id, address + offset)] = value
+
+
+def _forget_registers(host: str, port: int, transport: str, slave_id: int, addresses: Iterable[int]) -> None:
+    """Drop cached holding register values whose state on the device is unknown."""
+    cache = _register_cache.get(_client_key(host, port, transport), {})
+    for address in addresses:
+        cache.pop((slave_id, address), None)
+
+
+def _write_runs(values: Dict[int, int]) -> List[Tuple[int, List[int]]]:
+    """Group address -> value writes into (start, values) runs of consecutive addresses."""
+    runs: List[Tuple[int, List[int]]] = []
+    for address in sorted(values):
+        if runs and address == runs[-1][0] + len(runs[-1][1]) and len(runs[-1][1]) < MAX_WRITE_REGISTERS:
+            runs[-1][1].append(values[address])
+        else:
+            runs.append((address, [values[address]]))
+    return runs
+
+
+def _semaphore(host: str, port: int, transport: str) -> asyncio.Semaphore:
+    """Return the semaphore bounding in-flight requests to an endpoint."""
+    return _client_semaphores.setdefault(_client_key(host, port, transport), asyncio.Semaphore(get_settings().max_inflight))
+
+
+async def _multi(calls: Iterable[Awaitable[Any]]) -> List[Any]:
+    """Run Modbus calls concurrently and return their results in order."""
+    return await asyncio.gather(*calls)
+
+
+def _coalesce_reads(
+    reads: List[Tuple[int, int, int]], max_gap: Optional[int] = None
+) -> List[Tuple[int, int, int]]:
+    """
+    Merge (slave_id, address, count) reads into as few (slave_id, start, count) spans as possible.
+
+    Reads on the same slave are merged when the gap between them is at most max_gap
+    registers (default MODBUS_BATCH_MAX_GAP) and the merged span stays within MAX_READ_REGISTERS.
+    """
+    if max_gap is None:
+        max_gap = get_settings().batch_max_gap
+    spans: List[Tuple[int, int, int]] = []
+    for slave_id, address, count in sorted(reads):
+        if spans:
+            span_slave, start, span_count = spans[-1]
+            end = max(start + span_count, address + count)
+            if (span_slave == slave_id
+                    and address <= start + span_count + max_gap
+                    and end - start <= MAX_READ_REGISTERS):
+                spans[-1] = (slave_id, start, end - start)
+                continue
+        spans.append((slave_id, address, count))
+    return spans
+
+
+class BatchReadCoalescer:
+    """
+    Merges single holding register reads arriving within MODBUS_COALESCE_WINDOW_MS of each
+    other into as few read requests as possible, per endpoint and slave.
+
+    Each (transport, host, port, slave_id) gets a queue of (address, future) entries and a
+    task that collects a window's worth of them, merges them like read_registers_batch does
+    and resolves each future with the response covering its register and the offset in it.
+    Both are dropped once no reads arrive for COALESCE_IDLE_TIMEOUT seconds.
+    """
+
+    def __init__(self) -> None:
+        self._queues: Dict[Tuple[str, str, int, int], asyncio.Queue] = {}
+        self._tasks: Dict[Tuple[str, str, int, int], asyncio.Task] = {}
+
+    async def read(self, host: str, port: int, transport: str, slave_id: int, address: int) -> Tuple[Any, int]:
+        """Read one holding register; return the response holding it and its offset in the response."""
+        key = (transport, host, port, slave_id)
+        queue = self._queues.get(key)
+        if queue is None:
+            queue = self._queues[key] = asyncio.Queue()
+            self._tasks[key] = asyncio.create_task(self._run(key, queue))
+        future = asyncio.get_running_loop().create_future()
+        queue.put_nowait((address, future))
+        return await future
+
+    def close(self) -> None:
+        """Stop the batching tasks, failing the reads still waiting for them."""
+        for task in self._tasks.values():
+            task.cancel()
+        error = ConnectionException("Server shutting down")
+        for queue in self._queues.values():
+            while not queue.empty():
+                self._fail([queue.get_nowait()], error)
+        self._tasks.clear()
+        self._queues.clear()
+
+    async def _run(self, key: Tuple[str, str, int, int], queue: asyncio.Queue) -> None:
+        """Collect queued reads for up to the window (or a full span's worth) and read them."""
+        loop = asyncio.get_running_loop()
+        batch: List[Tuple[int, asyncio.Future]] = []
+        try:
+            while True:
+                try:
+                    batch = [await asyncio.wait_for(queue.get(), COALESCE_IDLE_TIMEOUT)]
+                except asyncio.TimeoutError:
+                    if queue.empty():
+                        break
+                    continue
+                deadline = loop.time() + get_settings().coalesce_window_ms / 1000
+                while len(batch) < MAX_READ_REGISTERS:
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), deadline - loop.time()))
+                    except asyncio.TimeoutError:
+                        break
+                # Reads queued meanwhile form the next batch
+                spans = _coalesce_reads([(key[3], address, 1) for address, _ in batch])
+                await _multi(
+                    self._read_span(key, start, count, [(a, f) for a, f in batch if start <= a < start + count])
+                    for _, start, count in spans
+                )
+        finally:
+            # Reads taken off the queue but unanswered when close() cancelled the task
+            self._fail(batch, ConnectionException("Server shutting down"))
+        # Idle: forget the endpoint; the next read for it starts a new task
+        if self._queues.get(key) is queue:
+            del self._queues[key]
+            del self._tasks[key]
+
+    async def _read_span(
+        self, key: Tuple[str, str, int, int], start: int, count: int, waiters: List[Tuple[int, asyncio.Future]]
+    ) -> None:
+        """Read a span of registers and resolve the futures waiting for registers in it."""
+        transport, host, port, slave_id = key
+        try:
+            result = await _read(host, port, transport, "read_holding_registers", slave_id, start, count)
+            failed = result.isError() or len(result.registers) < count
+        except ModbusException as e:
+            if count == 1:
+                self._fail(waiters, e)
+                return
+            # Some devices drop requests for registers they don't have instead of answering them
+            failed = True
+        except Exception as e:  # Raised in the waiting read_register calls instead
+            self._fail(waiters, e)
+            return
+        if count > 1 and failed:
+            # Registers between the requested ones may not exist; read the requested ones alone
+            await _multi(self._read_span(key, address, 1, [(address, future)]) for address, future in waiters)
+            return
+        for address, future in waiters:
+            if not future.done():
+                future.set_result((result, address - start))
+
+    @staticmethod
+    def _fail(waiters: List[Tuple[int, asyncio.Future]], error: Exception) -> None:
+        """Raise error in the read_register calls waiting for these registers."""
+        for _, future in waiters:
+            if not future.done():
+                future.set_exception(error)
+
+
+_coalescer = BatchReadCoalescer()
+
 
+def close_clients() -> None:
+    """Close and forget all cached Modbus clients and their keepalive tasks."""
+    for key in list(_clients):
+        _discard_client(key)
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Close cached Modbus connections and stop their keepalive probes and read batching when the MCP server shuts down."""
     try:
-        await client.connect()
-        # Note: pymodbus connect() might not raise exception even if connection fails,
-        # but client.connected should be checked if critical.
-        # However, we'll let the operations fail if not connected for simplicity,
-        # or we could raise here.
-        if not client.connected:
-             raise RuntimeError(f"Failed to connect to Modbus {transport} device at {host}:{port}")
-        yield client
+        yield
     finally:
-        if client:
-            client.close()
+        _coalescer.close()
+        close_clients()
 
 
-# Initialize MCP server without lifespan (stateless per request)
+# Initialize MCP server; the lifespan closes the cached Modbus connections
 mcp = FastMCP(
     name="Modbus MCP Server",
     dependencies=["pymodbus"],
+    lifespan=lifespan,
 )
 
+# FastMCP's log level (FASTMCP_LOG_LEVEL); tool messages are only rendered if it lets INFO through
+_INFO_ENABLED = logging.getLevelName(mcp.settings.log_level) <= logging.INFO
+
+
+async def _log_info(ctx: Context, message: str, *args: Any) -> None:
+    """Send an info message to the client, %-formatting it with args only if it will be logged."""
+    if not _INFO_ENABLED:
+        return
+    try:
+        await ctx.info(message % args if args else message)
+    except ValueError:
+        # No request to log to, e.g. when a tool is run through FastMCP.call_tool()
+        pass
+
 # Tools: Read and write Modbus registers
 @mcp.tool()
 async def read_register(
     address: int, 
     ctx: Context, 
-    slave_id: int = MODBUS_DEFAULT_SLAVE_ID,
-    host: str = MODBUS_HOST,
-    port: int = MODBUS_PORT,
-    transport: str = MODBUS_TYPE
+    slave_id: Optional[int] = None,
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    transport: Optional[str] = None
 ) -> str: 
     """
     Read a single Modbus holding register.
@@ -82,17 +574,23 @@ async def read_register(
         slave_id (int): The Modbus slave ID (device ID).
         host (str): The target host IP or hostname.
         port (int): The target port (default 502).
-        transport (str): The transport type ('tcp', 'udp', 'serial').
+        transport (str): The transport type ('tcp', 'tcp+uring', 'udp', 'serial').
     Returns:
         str: The value of the register or an error message.
     """
+    slave_id = get_settings().default_slave_id if slave_id is None else slave_id
+    host, port, transport = _endpoint(host, port, transport)
     try:
-        async with get_modbus_client(host, port, transport) as client:
-            result = await client.read_holding_registers(address=address, count=1, slave=slave_id) 
-            if result.isError():
-                return f"Error reading register {address} from slave {slave_id} at {host}:{port}: {result}"
-            ctx.info(f"Read register {address} from slave {slave_id} at {host}:{port}: {result.registers[0]}")
-            return f"Slave {slave_id}, Register {address} Value: {result.registers[0]}"
+        if get_settings().coalesce_window_ms > 0:
+            # Merged with other read_register calls arriving at about the same time
+            result, offset = await _coalescer.read(host, port, transport, slave_id, address)
+        else:
+            result, offset = await _read(host, port, transport, "read_holding_registers", slave_id, address, 1), 0
+        if result.isError() or offset >= len(result.registers):
+            return f"Error reading register {address} from slave {slave_id} at {host}:{port}: {result}"
+        value = result.registers[offset]
+        await _log_info(ctx, "Read register %s from slave %s at %s:%s: %s", address, slave_id, host, port, value)
+        return f"Slave {slave_id}, Register {address} Value: {value}"
     except (ModbusException, RuntimeError, ValueError) as e:
         return f"Error communicating with slave {slave_id} at {host}:{port}: {str(e)}"
 
@@ -101,10 +599,10 @@ async def write_register(
     address: int, 
     value: int, 
     ctx: Context, 
-    slave_id: int = MODBUS_DEFAULT_SLAVE_ID,
-    host: str = MODBUS_HOST,
-    port: int = MODBUS_PORT,
-    transport: str = MODBUS_TYPE
+    slave_id: Optional[int] = None,
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    transport: Optional[str] = None
 ) -> str:
     """
     Write a value to a Modbus holding register.
@@ -120,13 +618,21 @@ async def write_register(
     Returns:
         str: Success message or an error message.
     """
+    slave_id = get_settings().default_slave_id if slave_id is None else slave_id
+    host, port, transport = _endpoint(host, port, transport)
     try:
-        async with get_modbus_client(host, port, transport) as client:
+        client = await get_client(host, port, transport)
+        _forget_registers(host, port, transport, slave_id, (address,))
+        try:
             result = await client.write_register(address=address, value=value, slave=slave_id)
-            if result.isError():
-                return f"Error writing to register {address} on slave {slave_id} at {host}:{port}: {result}"
-            ctx.info(f"Wrote {value} to register {address} on slave {slave_id} at {host}:{port}")
-            return f"Successfully wrote {value} to register {address} on slave {slave_id}"
+        finally:
+            # Also on failure: the device may have applied the write anyway
+            _invalidate_reads(host, port, transport, "read_holding_registers", slave_id, address, 1)
+        if result.isError():
+            return f"Error writing to register {address} on slave {slave_id} at {host}:{port}: {result}"
+        _remember_registers(host, port, transport, slave_id, address, (value,))
+        await _log_info(ctx, "Wrote %s to register %s on slave %s at %s:%s", value, address, slave_id, host, port)
+        return f"Successfully wrote {value} to register {address} on slave {slave_id}"
     except (ModbusException, RuntimeError, ValueError) as e:
         return f"Error communicating with slave {slave_id} at {host}:{port}: {str(e)}"
 
@@ -136,10 +642,10 @@ async def read_coils(
     address: int, 
     count: int, 
     ctx: Context, 
-    slave_id: int = MODBUS_DEFAULT_SLAVE_ID,
-    host: str = MODBUS_HOST,
-    port: int = MODBUS_PORT,
-    transport: str = MODBUS_TYPE
+    slave_id: Optional[int] = None,
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    transport: Optional[str] = None
 ) -> str:
     """
     Read the status of multiple Modbus coils.
@@ -155,15 +661,16 @@ async def read_coils(
     Returns:
         str: A list of coil states (True/False) or an error message.
     """
+    slave_id = get_settings().default_slave_id if slave_id is None else slave_id
+    host, port, transport = _endpoint(host, port, transport)
     try:
         if count <= 0:
             return "Error: Count must be positive"
-        async with get_modbus_client(host, port, transport) as client:
-            result = await client.read_coils(address=address, count=count, slave=slave_id)
-            if result.isError():
-                return f"Error reading coils starting at {address} from slave {slave_id} at {host}:{port}: {result}"
-            ctx.info(f"Read {count} coils starting at {address} from slave {slave_id} at {host}:{port}: {result.bits}")
-            return f"Slave {slave_id}, Coils {address} to {address+count-1}: {result.bits[:count]}"
+        result = await _read(host, port, transport, "read_coils", slave_id, address, count)
+        if result.isError():
+            return f"Error reading coils starting at {address} from slave {slave_id} at {host}:{port}: {result}"
+        await _log_info(ctx, "Read %s coils starting at %s from slave %s at %s:%s: %s", count, address, slave_id, host, port, result.bits)
+        return f"Slave {slave_id}, Coils {address} to {address+count-1}: {result.bits[:count]}"
     except (ModbusException, RuntimeError, ValueError) as e:
         return f"Error communicating with slave {slave_id} at {host}:{port}: {str(e)}"
 
@@ -172,10 +679,10 @@ async def write_coil(
     address: int, 
     value: bool, 
     ctx: Context, 
-    slave_id: int = MODBUS_DEFAULT_SLAVE_ID,
-    host: str = MODBUS_HOST,
-    port: int = MODBUS_PORT,
-    transport: str = MODBUS_TYPE
+    slave_id: Optional[int] = None,
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    transport: Optional[str] = None
 ) -> str:
     """
     Write a value to a single Modbus coil.
@@ -191,13 +698,19 @@ async def write_coil(
     Returns:
         str: Success message or an error message.
     """
+    slave_id = get_settings().default_slave_id if slave_id is None else slave_id
+    host, port, transport = _endpoint(host, port, transport)
     try:
-        async with get_modbus_client(host, port, transport) as client:
+        client = await get_client(host, port, transport)
+        try:
             result = await client.write_coil(address=address, value=value, slave=slave_id)
-            if result.isError():
-                return f"Error writing to coil {address} on slave {slave_id} at {host}:{port}: {result}"
-            ctx.info(f"Wrote {value} to coil {address} on slave {slave_id} at {host}:{port}")
-            return f"Successfully wrote {value} to coil {address} on slave {slave_id}"
+        finally:
+            # Also on failure: the device may have applied the write anyway
+            _invalidate_reads(host, port, transport, "read_coils", slave_id, address, 1)
+        if result.isError():
+            return f"Error writing to coil {address} on slave {slave_id} at {host}:{port}: {result}"
+        await _log_info(ctx, "Wrote %s to coil %s on slave %s at %s:%s", value, address, slave_id, host, port)
+        return f"Successfully wrote {value} to coil {address} on slave {slave_id}"
     except (ModbusException, RuntimeError, ValueError) as e:
         return f"Error communicating with slave {slave_id} at {host}:{port}: {str(e)}"
 
@@ -207,10 +720,10 @@ async def read_input_registers(
     address: int, 
     count: int, 
     ctx: Context, 
-    slave_id: int = MODBUS_DEFAULT_SLAVE_ID,
-    host: str = MODBUS_HOST,
-    port: int = MODBUS_PORT,
-    transport: str = MODBUS_TYPE
+    slave_id: Optional[int] = None,
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    transport: Optional[str] = None
 ) -> str:
     """
     Read multiple Modbus input registers.
@@ -226,15 +739,16 @@ async def read_input_registers(
     Returns:
         str: A list of register values or an error message.
     """
+    slave_id = get_settings().default_slave_id if slave_id is None else slave_id
+    host, port, transport = _endpoint(host, port, transport)
     try:
         if count <= 0:
             return "Error: Count must be positive"
-        async with get_modbus_client(host, port, transport) as client:
-            result = await client.read_input_registers(address=address, count=count, slave=slave_id)
-            if result.isError():
-                return f"Error reading input registers starting at {address} from slave {slave_id} at {host}:{port}: {result}"
-            ctx.info(f"Read {count} input registers starting at {address} from slave {slave_id} at {host}:{port}: {result.registers}")
-            return f"Slave {slave_id}, Input Registers {address} to {address+count-1}: {result.registers}"
+        result = await _read(host, port, transport, "read_input_registers", slave_id, address, count)
+        if result.isError():
+            return f"Error reading input registers starting at {address} from slave {slave_id} at {host}:{port}: {result}"
+        await _log_info(ctx, "Read %s input registers starting at %s from slave %s at %s:%s: %s", count, address, slave_id, host, port, result.registers)
+        return f"Slave {slave_id}, Input Registers {address} to {address+count-1}: {result.registers}"
     except (ModbusException, RuntimeError, ValueError) as e:
         return f"Error communicating with slave {slave_id} at {host}:{port}: {str(e)}"
 
@@ -244,10 +758,10 @@ async def read_multiple_holding_registers(
     address: int, 
     count: int, 
     ctx: Context, 
-    slave_id: int = MODBUS_DEFAULT_SLAVE_ID,
-    host: str = MODBUS_HOST,
-    port: int = MODBUS_PORT,
-    transport: str = MODBUS_TYPE
+    slave_id: Optional[int] = None,
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    transport: Optional[str] = None
 ) -> str:
     """
     Read multiple Modbus holding registers.
@@ -263,18 +777,307 @@ async def read_multiple_holding_registers(
     Returns:
         str: A list of register values or an error message.
     """
+    slave_id = get_settings().default_slave_id if slave_id is None else slave_id
+    host, port, transport = _endpoint(host, port, transport)
     try:
         if count <= 0:
             return "Error: Count must be positive"
-        async with get_modbus_client(host, port, transport) as client:
-            result = await client.read_holding_registers(address=address, count=count, slave=slave_id)
+        result = await _read(host, port, transport, "read_holding_registers", slave_id, address, count)
+        if result.isError():
+            return f"Error reading holding registers starting at {address} from slave {slave_id} at {host}:{port}: {result}"
+        await _log_info(ctx, "Read %s holding registers starting at %s from slave %s at %s:%s: %s", count, address, slave_id, host, port, result.registers)
+        return f"Slave {slave_id}, Holding Registers {address} to {address+count-1}: {result.registers}"
+    except (ModbusException, RuntimeError, ValueError) as e:
+        return f"Error communicating with slave {slave_id} at {host}:{port}: {str(e)}"
+
+# Tools: Batched holding register reads
+@mcp.tool()
+async def read_registers_batch(
+    requests: List[Dict[str, int]],
+    ctx: Context,
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    transport: Optional[str] = None
+) -> str:
+    """
+    Read several ranges of Modbus holding registers, merging nearby ranges into as few requests as possible.
+
+    Parameters:
+        requests (list): The ranges to read, each an object with "address" (0-65535),
+            optional "count" (1-125, default 1) and optional "slave_id".
+        host (str): The target host IP or hostname.
+        port (int): The target port.
+        transport (str): The transport type.
+
+    Returns:
+        str: One line of register values per requested range, in request order, or an error message.
+    """
+    host, port, transport = _endpoint(host, port, transport)
+    default_slave_id = get_settings().default_slave_id
+    try:
+        reads = [
+            (r.get("slave_id", default_slave_id), r["address"], r.get("count", 1))
+            for r in requests
+        ]
+    except (KeyError, AttributeError):
+        return "Error: Each request must be an object with an 'address'"
+    if not reads:
+        return "Error: No registers requested"
+    if any(not 0 < count <= MAX_READ_REGISTERS for _, _, count in reads):
+        return f"Error: Count must be between 1 and {MAX_READ_REGISTERS}"
+    try:
+        spans = _coalesce_reads(reads)
+        fetched = []
+        for slave_id, start, count in spans:
+            # The requested ranges in this span, without the unrequested registers bridging them
+            parts = _coalesce_reads(
+                [r for r in reads if r[0] == slave_id and start <= r[1] < start + count], max_gap=0)
+            try:
+                result = await _read(host, port, transport, "read_holding_registers", slave_id, start, count)
+                failed = result.isError() or len(result.registers) < count
+            except ModbusException:
+                if len(parts) == 1:
+                    raise
+                failed = True
+            if failed and len(parts) > 1:
+                # A bridged register may not exist on the device; read the requested ranges alone
+                for _, part_start, part_count in parts:
+                    result = await _read(host, port, transport, "read_holding_registers", slave_id, part_start, part_count)
+                    if result.isError():
+                        return f"Error reading holding registers starting at {part_start} from slave {slave_id} at {host}:{port}: {result}"
+                    fetched.append((slave_id, part_start, result.registers))
+                continue
             if result.isError():
-                return f"Error reading holding registers starting at {address} from slave {slave_id} at {host}:{port}: {result}"
-            ctx.info(f"Read {count} holding registers starting at {address} from slave {slave_id} at {host}:{port}: {result.registers}")
-            return f"Slave {slave_id}, Holding Registers {address} to {address+count-1}: {result.registers}"
+                return f"Error reading holding registers starting at {start} from slave {slave_id} at {host}:{port}: {result}"
+            fetched.append((slave_id, start, result.registers))
+        await _log_info(ctx, "Read %s register ranges from %s:%s in %s requests", len(reads), host, port, len(spans))
+        lines = []
+        for slave_id, address, count in reads:
+            for span_slave, start, registers in fetched:
+                if span_slave == slave_id and start <= address and address + count <= start + len(registers):
+                    offset = address - start
+                    lines.append(f"Slave {slave_id}, Holding Registers {address} to {address+count-1}: "
+                                 f"{registers[offset:offset+count]}")
+                    break
+            else:
+                lines.append(f"Error: No data for holding registers {address} to {address + count - 1} from slave {slave_id}")
+        return "\n".join(lines)
+    except (ModbusException, RuntimeError, ValueError) as e:
+        return f"Error communicating with {host}:{port}: {str(e)}"
+
+# Tools: Pipelined holding register writes
+async def _write_register_runs(
+    client: ModbusBaseClient, host: str, port: int, transport: str, slave_id: int, values: Dict[int, int]
+) -> Tuple[int, Optional[str]]:
+    """
+    Write address -> value pairs in runs of consecutive registers, pipelined on the io_uring client.
+
+    Returns the number of requests sent and an error message if a write failed.
+    """
+    pipelined = isinstance(client, UringModbusTcpClient)
+    # Until a response or the read-back confirms them, the device state is unknown
+    _forget_registers(host, port, transport, slave_id, values)
+    runs = _write_runs(values)
+    for address, run in runs:
+        if len(run) == 1:
+            request = client.write_register(address=address, value=run[0], slave=slave_id,
+                                            no_response_expected=pipelined)
+        else:
+            request = client.write_registers(address=address, values=run, slave=slave_id,
+                                             no_response_expected=pipelined)
+        try:
+            result = await request
+        finally:
+            # Also on failure: the device may have applied the write anyway
+            _invalidate_reads(host, port, transport, "read_holding_registers", slave_id, address, len(run))
+        if pipelined:
+            # Responses queue up behind each other; the client skips them by transaction id
+            continue
+        if result.isError():
+            return 0, f"Error writing to registers starting at {address} on slave {slave_id} at {host}:{port}: {result}"
+        _remember_registers(host, port, transport, slave_id, address, run)
+    return len(runs), None
+
+@mcp.tool()
+async def write_registers_pipelined(
+    writes: List[Tuple[int, int]],
+    ctx: Context,
+    verify: bool = True,
+    only_changed: bool = False,
+    slave_id: Optional[int] = None,
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    transport: Optional[str] = None
+) -> str:
+    """
+    Write several Modbus holding registers, pipelined where the transport allows it.
+
+    Consecutive addresses are written together with one write-multiple-registers request.
+    Over 'tcp+uring' the requests are sent back to back without waiting for each response.
+    pymodbus clients keep one request outstanding, so other transports wait for each write.
+
+    Parameters:
+        writes (list): The (address, value) pairs to write; the last value for an address wins.
+        verify (bool): Read the registers back afterwards and check the written values.
+            The written addresses must then lie within 125 consecutive registers.
+        only_changed (bool): Skip registers last read or written by this server with the same value.
+            With verify, skipped registers the read-back shows have changed since are written after all.
+        slave_id (int): The Modbus slave ID (device ID).
+        host (str): The target host IP or hostname.
+        port (int): The target port.
+        transport (str): The transport type.
+
+    Returns:
+        str: Success message, the registers that failed verification, or an error message.
+    """
+    slave_id = get_settings().default_slave_id if slave_id is None else slave_id
+    host, port, transport = _endpoint(host, port, transport)
+    if not writes:
+        return "Error: No writes requested"
+    expected = dict(writes)
+    start = min(expected)
+    count = max(expected) - start + 1
+    if verify and count > MAX_READ_REGISTERS:
+        return f"Error: Written registers must lie within {MAX_READ_REGISTERS} consecutive registers to verify"
+    changed = expected
+    if only_changed:
+        cache = _register_cache.get(_client_key(host, port, transport), {})
+        changed = {address: value for address, value in expected.items() if cache.get((slave_id, address)) != value}
+    try:
+        client = await get_client(host, port, transport)
+        requests, error = await _write_register_runs(client, host, port, transport, slave_id, changed)
+        if error:
+            return error
+        if not verify:
+            await _log_info(ctx, "Sent %s register writes in %s requests to slave %s at %s:%s", len(changed), requests, slave_id, host, port)
+            return (f"Sent {len(changed)} register writes to slave {slave_id} without verification"
+                    f" ({len(expected) - len(changed)} unchanged registers skipped)")
+        result = await _read(host, port, transport, "read_holding_registers", slave_id, start, count, fresh=True)
+        if result.isError():
+            return f"Error reading back holding registers starting at {start} from slave {slave_id} at {host}:{port}: {result}"
+        # Skipped registers the device or another master has changed since this server last saw them
+        stale = {
+            address: value for address, value in expected.items()
+            if address not in changed and result.registers[address - start] != value
+        }
+        if stale:
+            retried, error = await _write_register_runs(client, host, port, transport, slave_id, stale)
+            if error:
+                return error
+            requests += retried
+            changed = {**changed, **stale}
+            result = await _read(host, port, transport, "read_holding_registers", slave_id, start, count, fresh=True)
+            if result.isError():
+                return f"Error reading back holding registers starting at {start} from slave {slave_id} at {host}:{port}: {result}"
+        mismatches = [
+            f"{address} (expected {value}, read {result.registers[address - start]})"
+            for address, value in sorted(expected.items())
+            if result.registers[address - start] != value
+        ]
+        if mismatches:
+            return f"Verification failed on slave {slave_id} for registers: {', '.join(mismatches)}"
+        await _log_info(ctx, "Wrote %s registers in %s requests and verified %s on slave %s at %s:%s", len(changed), requests, len(expected), slave_id, host, port)
+        return f"Successfully wrote and verified {len(expected)} registers on slave {slave_id}"
     except (ModbusException, RuntimeError, ValueError) as e:
         return f"Error communicating with slave {slave_id} at {host}:{port}: {str(e)}"
 
+# Tools: Typed register reads
+@mcp.tool()
+async def read_float32_batch(
+    address: int,
+    count: int,
+    ctx: Context,
+    wordswap: bool = False,
+    slave_id: Optional[int] = None,
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    transport: Optional[str] = None
+) -> str:
+    """
+    Read consecutive 32-bit floating point values, each stored in two Modbus holding registers.
+
+    Parameters:
+        address (int): The address of the first holding register (0-65535).
+        count (int): The number of float values to read (1-62).
+        wordswap (bool): True if the device stores the low word of each value first.
+        slave_id (int): The Modbus slave ID (device ID).
+        host (str): The target host IP or hostname.
+        port (int): The target port.
+        transport (str): The transport type.
+
+    Returns:
+        str: A list of float values or an error message.
+    """
+    slave_id = get_settings().default_slave_id if slave_id is None else slave_id
+    host, port, transport = _endpoint(host, port, transport)
+    try:
+        if not 0 < count <= MAX_READ_REGISTERS // 2:
+            return f"Error: Count must be between 1 and {MAX_READ_REGISTERS // 2}"
+        result = await _read(host, port, transport, "read_holding_registers", slave_id, address, 2 * count)
+        if result.isError():
+            return f"Error reading holding registers starting at {address} from slave {slave_id} at {host}:{port}: {result}"
+        values = decode_registers(result.registers, "float32", wordswap)
+        await _log_info(ctx, "Read %s float32 values starting at %s from slave %s at %s:%s", count, address, slave_id, host, port)
+        return f"Slave {slave_id}, Float32 Registers {address} to {address+2*count-1}: [{', '.join(map(str, values))}]"
+    except (ModbusException, RuntimeError, ValueError) as e:
+        return f"Error communicating with slave {slave_id} at {host}:{port}: {str(e)}"
+
+# Tools: Concurrent reads
+async def _read_entry(entry: Dict[str, Any], host: str, port: int, transport: str) -> str:
+    """Perform one read_many entry and format its result like the single-read tools."""
+    function = entry.get("function", "holding_registers")
+    address = entry["address"]
+    count = entry.get("count", 1)
+    slave_id = entry.get("slave_id", get_settings().default_slave_id)
+    host = entry.get("host", host)
+    port = entry.get("port", port)
+    transport = sys.intern(entry.get("transport", transport))
+    if function not in _READ_FUNCTIONS:
+        return f"Error: Invalid function: {function}. Must be one of {', '.join(_READ_FUNCTIONS)}."
+    if count <= 0:
+        return "Error: Count must be positive"
+    method, label, attribute = _READ_FUNCTIONS[function]
+    try:
+        async with _semaphore(host, port, transport):
+            result = await _read(host, port, transport, method, slave_id, address, count)
+        if result.isError():
+            return f"Error reading {label.lower()} starting at {address} from slave {slave_id} at {host}:{port}: {result}"
+        return f"Slave {slave_id}, {label} {address} to {address+count-1}: {getattr(result, attribute)[:count]}"
+    except (ModbusException, RuntimeError, ValueError) as e:
+        return f"Error communicating with slave {slave_id} at {host}:{port}: {str(e)}"
+
+@mcp.tool()
+async def read_many(
+    reads: List[Dict[str, Any]],
+    ctx: Context,
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    transport: Optional[str] = None
+) -> str:
+    """
+    Perform several Modbus reads concurrently, possibly on different devices.
+
+    Parameters:
+        reads (list): The reads to perform, each an object with "address" (0-65535), optional
+            "function" ('holding_registers', 'input_registers' or 'coils', default 'holding_registers'),
+            optional "count" (default 1), optional "slave_id" and optional "host", "port" and
+            "transport" overriding the defaults below.
+        host (str): The default target host IP or hostname.
+        port (int): The default target port.
+        transport (str): The default transport type.
+
+    Returns:
+        str: One line per read, in request order, with its values or an error message.
+    """
+    host, port, transport = _endpoint(host, port, transport)
+    if not reads:
+        return "Error: No reads requested"
+    if any(not isinstance(entry, dict) or "address" not in entry for entry in reads):
+        return "Error: Each read must be an object with an 'address'"
+    lines = await _multi(_read_entry(entry, host, port, transport) for entry in reads)
+    await _log_info(ctx, "Performed %s concurrent reads", len(reads))
+    return "\n".join(lines)
+
 # Prompts: Templates for Modbus interactions
 @mcp.prompt()
 def analyze_register(value: str) -> List[base.Message]:
@@ -287,4 +1090,12 @@ def analyze_register(value: str) -> List[base.Message]:
 
 def main() -> None:
     """Run the MCP server."""
-    mcp.run()
\ No newline at end of file
+    # Only the server reads .env; the settings are parsed on first use, after this
+    load_dotenv()
+    _bind_endpoint_defaults(get_settings())
+    # uvloop is optional; fall back to the default asyncio loop if it's missing
+    if sys.platform != "win32" and importlib.util.find_spec("uvloop") is not None:
+        # A uvloop loop for this run only: uvloop.install() sets a global policy, deprecated on 3.12+
+        anyio.run(mcp.run_stdio_async, backend_options={"use_uvloop": True})
+    else:
+        mcp.run()
\ No newline at end of file
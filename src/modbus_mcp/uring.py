@@ -0,0 +1,373 @@
+import asyncio
+import functools
+import os
+import platform
+import socket
+import struct
+import sys
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from pymodbus.client.mixin import ModbusClientMixin
+from pymodbus.exceptions import ConnectionException, ModbusIOException
+from pymodbus.pdu import DecodePDU, ExceptionResponse, ModbusPDU
+
+try:
+    import liburing
+except ImportError:  # Optional dependency, see uring_available()
+    liburing = None
+
+# Oldest kernel whose io_uring supports the socket operations used here
+MIN_KERNEL_VERSION = (5, 10)
+# Oldest kernel accepting zero-length buffer-select receives ("use the whole buffer")
+BUFFER_SELECT_KERNEL_VERSION = (5, 19)
+# MBAP header: transaction id, protocol id, length, unit id
+MBAP_HEADER = struct.Struct(">HHHB")
+MBAP_HEADER_SIZE = MBAP_HEADER.size
+# MBAP header followed by the function code, which starts every request PDU
+MBAP = struct.Struct(">HHHBB")
+# Big-endian 16-bit field within the MBAP header
+_UINT16 = struct.Struct(">H")
+# SO_LINGER value (on, zero timeout) making close() reset the connection
+_LINGER_RESET = struct.pack("ii", 1, 0)
+# MBAP header plus the largest Modbus PDU (253 bytes)
+MAX_FRAME_SIZE = 260
+RING_ENTRIES = 32
+# Receive buffers handed to the kernel, which picks one per completed receive
+RECV_BUFFERS = 4
+RECV_BUFFER_GROUP = 0
+# Read coils and read discrete inputs: responses carrying a byte count and packed bits
+BIT_FUNCTION_CODES = (1, 2)
+
+
+def _kernel_version() -> Tuple[int, int]:
+    """Return the running kernel's (major, minor) version, or (0, 0) if unknown."""
+    try:
+        major, minor = platform.release().split(".")[:2]
+        return int(major), int(minor.split("-")[0])
+    except ValueError:
+        return 0, 0
+
+
+@functools.cache
+def uring_available() -> bool:
+    """Return True if io_uring can be used for Modbus TCP on this system."""
+    if sys.platform != "linux" or liburing is None or _kernel_version() < MIN_KERNEL_VERSION:
+        return False
+    # It may still be disabled, by the kernel.io_uring_disabled sysctl or a seccomp filter
+    ring = liburing.Ring()
+    try:
+        liburing.io_uring_queue_init(1, ring)
+    except OSError:
+        return False
+    liburing.io_uring_queue_exit(ring)
+    return True
+
+
+def _frame_size(buf: bytearray) -> int:
+    """Return the size of the MBAP frame whose header starts buf."""
+    return 6 + _UINT16.unpack_from(buf, 4)[0]
+
+
+def _transaction_id(buf: bytearray) -> int:
+    """Return the transaction id of the MBAP frame whose header starts buf."""
+    return _UINT16.unpack_from(buf)[0]
+
+
+def _unpack_bits(data: memoryview) -> List[bool]:
+    """Unpack Modbus bit data, least significant bit of each byte first, into booleans."""
+    return np.unpackbits(np.frombuffer(data, dtype=np.uint8), bitorder="little").astype(bool).tolist()
+
+
+class UringModbusTcpClient(ModbusClientMixin[Awaitable[ModbusPDU]]):
+    """
+    Asyncio Modbus TCP client that sends and receives frames through io_uring.
+
+    The request methods (read_holding_registers, write_register, ...) are those of
+    pymodbus' client mixin, so this client can be used in place of AsyncModbusTcpClient.
+    The send and the receive of a transaction are submitted to the ring together, and
+    completions are picked up by the event loop through an eventfd. Where the kernel
+    allows it, responses land in a pool of buffers provided to the ring up front
+    (IOSQE_BUFFER_SELECT) and are parsed in place.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 502,
+        timeout: float = 3,
+        trace_connect: Optional[Callable[[bool], None]] = None,
+    ) -> None:
+        ModbusClientMixin.__init__(self)
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.trace_connect = trace_connect
+        self.socket: Optional[socket.socket] = None
+        self._ring: Any = None
+        self._cqe: Any = None
+        self._eventfd = -1
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._user_data = 0
+        self._transaction_id = 0
+        self._lock = asyncio.Lock()
+        self._decoder = DecodePDU(False)
+        # Kept for the lifetime of the client: the kernel writes into these asynchronously
+        self._recv_buffer = bytearray(MAX_FRAME_SIZE)
+        self._recv_pool = [bytearray(MAX_FRAME_SIZE) for _ in range(RECV_BUFFERS)]
+        self._buffer_select = _kernel_version() >= BUFFER_SELECT_KERNEL_VERSION
+
+    @property
+    def connected(self) -> bool:
+        """Return True if the client has an open connection the peer has not closed."""
+        if self.socket is None:
+            return False
+        try:
+            # Non-blocking peek: b"" means the peer closed, EAGAIN that the link is idle
+            if self.socket.recv(1, socket.MSG_PEEK | socket.MSG_DONTWAIT) != b"":
+                return True
+        except BlockingIOError:
+            return True
+        except OSError:
+            pass
+        # Drop the dead connection so the next connect() opens a new one
+        self.close()
+        return False
+
+    async def connect(self) -> bool:
+        """Open the TCP connection and the io_uring instance used to drive it."""
+        async with self._lock:
+            return await self._connect()
+
+    async def _connect(self) -> bool:
+        """Connect unless connected already; the caller holds the lock."""
+        if self.connected:
+            return True
+        loop = asyncio.get_running_loop()
+        try:
+            infos = await loop.getaddrinfo(self.host, self.port, type=socket.SOCK_STREAM)
+            family, sock_type, proto, _, address = infos[0]
+            sock = socket.socket(family, sock_type, proto)
+            sock.setblocking(False)
+            try:
+                await asyncio.wait_for(loop.sock_connect(sock, address), self.timeout)
+            except BaseException:
+                sock.close()
+                raise
+        except (OSError, asyncio.TimeoutError):
+            return False
+        # io_uring does its own polling; a blocking socket avoids -EAGAIN on older kernels
+        sock.setblocking(True)
+        if self._ring is None:
+            try:
+                self._setup_ring(loop)
+            except OSError:
+                sock.close()
+                return False
+        self.socket = sock
+        if self.trace_connect:
+            self.trace_connect(True)
+        return True
+
+    def close(self) -> None:
+        """Close the connection and release the io_uring instance."""
+        self._close(socket.SHUT_RDWR)
+
+    def abort(self) -> None:
+        """Reset the connection, dropping unsent data, and release the io_uring instance."""
+        if self.socket is not None:
+            try:
+                self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, _LINGER_RESET)
+            except OSError:
+                pass
+        # Shutting down the sending side would send a FIN before the reset
+        self._close(socket.SHUT_RD)
+
+    def _close(self, how: int) -> None:
+        """Shut the socket down in direction how, close it and release the io_uring instance."""
+        if self.socket is not None:
+            try:
+                # Completes any receive still in flight
+                self.socket.shutdown(how)
+            except OSError:
+                pass
+            self.socket.close()
+            self.socket = None
+            if self.trace_connect:
+                self.trace_connect(False)
+        if self._ring is not None:
+            asyncio.get_event_loop().remove_reader(self._eventfd)
+            liburing.io_uring_queue_exit(self._ring)
+            os.close(self._eventfd)
+            self._ring = None
+            self._eventfd = -1
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ConnectionException("Connection closed"))
+        self._pending.clear()
+
+    async def execute(self, no_response_expected: bool, request: ModbusPDU) -> ModbusPDU:
+        """Send a request and return its decoded response."""
+        async with self._lock:
+            # Checked under the lock: a timed out request ahead of this one closes the connection
+            if not await self._connect():
+                raise ConnectionException(f"Failed to connect to {self.host}:{self.port}")
+            self._transaction_id = self._transaction_id % 0xFFFF + 1
+            request.transaction_id = self._transaction_id
+            data = request.encode()
+            # Sent as a whole, so sized exactly: the binding has no length argument for sends
+            frame = bytearray(MBAP.size + len(data))
+            MBAP.pack_into(frame, 0, request.transaction_id, 0, len(data) + 2, request.dev_id, request.function_code)
+            frame[MBAP.size:] = data
+            try:
+                if no_response_expected:
+                    await asyncio.wait_for(self._send(frame), self.timeout)
+                    return ExceptionResponse(0xff)
+                return await asyncio.wait_for(self._transact(frame, request), self.timeout)
+            except (OSError, asyncio.TimeoutError) as exc:
+                # The stream is out of sync (or gone); start over on the next request
+                self.close()
+                raise ModbusIOException(f"No response from {self.host}:{self.port}: {exc!r}") from exc
+
+    def _setup_ring(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Create the ring and route its completions to the event loop via an eventfd."""
+        ring = liburing.Ring()
+        # DEFER_TASKRUN is not used: it holds completions back until the ring is entered,
+        # so the eventfd would never fire.
+        try:
+            liburing.io_uring_queue_init(
+                RING_ENTRIES, ring,
+                liburing.IORING_SETUP_SINGLE_ISSUER | liburing.IORING_SETUP_COOP_TASKRUN,
+            )
+        except OSError:  # Kernels before 6.0 reject these flags
+            liburing.io_uring_queue_init(RING_ENTRIES, ring)
+        try:
+            self._eventfd = os.eventfd(0, os.EFD_NONBLOCK | os.EFD_CLOEXEC)
+            liburing.io_uring_register_eventfd(ring, self._eventfd)
+        except OSError:
+            if self._eventfd >= 0:
+                os.close(self._eventfd)
+                self._eventfd = -1
+            liburing.io_uring_queue_exit(ring)
+            raise
+        loop.add_reader(self._eventfd, self._reap)
+        self._ring = ring
+        self._cqe = liburing.Cqe()
+        if self._buffer_select:
+            for bid in range(RECV_BUFFERS):
+                self._provide_buffer(bid)
+
+    def _prepare(self, prep: Callable[[Any], None]) -> asyncio.Future:
+        """Queue an SQE filled in by prep and return a future for its (result, flags)."""
+        sqe = liburing.io_uring_get_sqe(self._ring)
+        prep(sqe)
+        self._user_data += 1
+        sqe.user_data = self._user_data
+        future = asyncio.get_running_loop().create_future()
+        self._pending[self._user_data] = future
+        return future
+
+    def _reap(self) -> None:
+        """Resolve the futures of all completed operations."""
+        try:
+            os.eventfd_read(self._eventfd)
+        except BlockingIOError:
+            pass
+        while True:
+            try:
+                liburing.io_uring_peek_cqe(self._ring, self._cqe)
+            except BlockingIOError:
+                return
+            cqe = self._cqe[0]
+            user_data, res, flags = cqe.user_data, cqe.res, cqe.flags
+            liburing.io_uring_cqe_seen(self._ring, cqe)
+            future = self._pending.pop(user_data, None)
+            if future is None or future.done():
+                continue
+            if res < 0:
+                future.set_exception(OSError(-res, os.strerror(-res)))
+            else:
+                future.set_result((res, flags))
+
+    def _provide_buffer(self, bid: int) -> None:
+        """Hand a receive buffer (back) to the kernel; it is submitted with the next request."""
+        sqe = liburing.io_uring_get_sqe(self._ring)
+        liburing.io_uring_prep_provide_buffers(sqe, self._recv_pool[bid], 1, RECV_BUFFER_GROUP, bid)
+        sqe.user_data = 0  # Nobody waits for this completion
+
+    def _prepare_recv(self, fd: int) -> asyncio.Future:
+        """Queue a receive, into a kernel-selected pool buffer if supported."""
+        if self._buffer_select:
+            def prep(sqe: Any) -> None:
+                liburing.io_uring_prep_recv(sqe, fd)  # Zero length: the whole selected buffer
+                liburing.io_uring_sqe_set_flags(sqe, liburing.IOSQE_BUFFER_SELECT)
+                liburing.io_uring_sqe_set_buf_group(sqe, RECV_BUFFER_GROUP)
+            return self._prepare(prep)
+        buf = self._recv_buffer
+        return self._prepare(lambda sqe: liburing.io_uring_prep_recv(sqe, fd, buf))
+
+    async def _send(self, frame: bytearray) -> None:
+        """Send a frame without waiting for a response."""
+        fd = self.socket.fileno()
+        sent = self._prepare(lambda sqe: liburing.io_uring_prep_send(sqe, fd, frame))
+        liburing.io_uring_submit(self._ring)
+        if (await sent)[0] != len(frame):
+            raise OSError("Short send")
+
+    async def _transact(self, frame: bytearray, request: ModbusPDU) -> ModbusPDU:
+        """Send a frame and receive the matching response with a single submission."""
+        fd = self.socket.fileno()
+        sent = self._prepare(lambda sqe: liburing.io_uring_prep_send(sqe, fd, frame))
+        received = self._prepare_recv(fd)
+        liburing.io_uring_submit(self._ring)
+        if (await sent)[0] != len(frame):
+            raise OSError("Short send")
+        data = bytearray()  # Only used if the response arrives in pieces or behind others
+        while True:
+            n, flags = await received
+            if n == 0:
+                raise OSError("Connection closed by peer")
+            if self._buffer_select:
+                bid = flags >> liburing.IORING_CQE_BUFFER_SHIFT
+                buf = self._recv_pool[bid]
+            else:
+                bid, buf = -1, self._recv_buffer
+            try:
+                if (not data and n >= MBAP_HEADER_SIZE and n == _frame_size(buf)
+                        and _transaction_id(buf) == request.transaction_id):
+                    # Usual case: the response came alone in one receive, parse it in place
+                    return self._decode(buf, request)
+                data += memoryview(buf)[:n]
+            finally:
+                if bid >= 0:
+                    self._provide_buffer(bid)
+            while len(data) >= MBAP_HEADER_SIZE and len(data) >= (frame_size := _frame_size(data)):
+                if _transaction_id(data) == request.transaction_id:
+                    return self._decode(data, request)
+                # Response to an earlier request sent with no_response_expected
+                del data[:frame_size]
+            received = self._prepare_recv(fd)
+            liburing.io_uring_submit(self._ring)
+
+    def _decode(self, buf: bytearray, request: ModbusPDU) -> ModbusPDU:
+        """Decode the response frame at the start of buf without copying it."""
+        transaction_id, _, length, dev_id = MBAP_HEADER.unpack_from(buf)
+        if transaction_id != request.transaction_id or dev_id != request.dev_id:
+            raise OSError(f"Unexpected response (transaction {transaction_id}, unit {dev_id})")
+        with memoryview(buf) as view:
+            pdu = view[MBAP_HEADER_SIZE:6 + length]
+            if pdu[0] in BIT_FUNCTION_CODES:
+                # pymodbus unpacks bits one by one in Python; up to 2000 coils per response
+                response = self._decoder.lookup[pdu[0]]()
+                response.bits = _unpack_bits(pdu[2:])
+            else:
+                response = self._decoder.decode(pdu)
+        if response is None:
+            raise ModbusIOException("Unable to decode response")
+        response.transaction_id = transaction_id
+        response.dev_id = dev_id
+        return response
+
+    def __str__(self) -> str:
+        return f"UringModbusTcpClient {self.host}:{self.port}"
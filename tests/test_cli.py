@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from modbus_mcp.cli import MAX_READ_REGISTERS, MAX_WRITE_REGISTERS, _coalesce_reads, _write_runs, decode_registers
+
+
+# _coalesce_reads
+
+def test_coalesce_nothing():
+    assert _coalesce_reads([], max_gap=0) == []
+
+
+def test_coalesce_adjacent():
+    assert _coalesce_reads([(1, 0, 2), (1, 2, 3)], max_gap=0) == [(1, 0, 5)]
+
+
+def test_coalesce_unsorted():
+    assert _coalesce_reads([(1, 10, 1), (1, 0, 2), (1, 2, 1)], max_gap=0) == [(1, 0, 3), (1, 10, 1)]
+
+
+@pytest.mark.parametrize("address, expected", [
+    (5, [(1, 0, 6)]),  # Gap of 3 registers: merged
+    (6, [(1, 0, 2), (1, 6, 1)]),  # Gap of 4 registers: kept apart
+])
+def test_coalesce_gap_limit(address, expected):
+    assert _coalesce_reads([(1, 0, 2), (1, address, 1)], max_gap=3) == expected
+
+
+def test_coalesce_overlapping():
+    assert _coalesce_reads([(1, 0, 10), (1, 2, 3), (1, 8, 4), (1, 8, 4)], max_gap=0) == [(1, 0, 12)]
+
+
+def test_coalesce_slaves_apart():
+    assert _coalesce_reads([(1, 0, 2), (2, 2, 2)], max_gap=10) == [(1, 0, 2), (2, 2, 2)]
+
+
+@pytest.mark.parametrize("count, expected", [
+    (25, [(1, 0, MAX_READ_REGISTERS)]),
+    (26, [(1, 0, 100), (1, 100, 26)]),
+])
+def test_coalesce_span_limit(count, expected):
+    assert _coalesce_reads([(1, 0, 100), (1, 100, count)], max_gap=0) == expected
+
+
+def test_coalesce_span_limit_with_gap():
+    assert _coalesce_reads([(1, 0, 1), (1, MAX_READ_REGISTERS, 1)], max_gap=200) == [(1, 0, 1), (1, 125, 1)]
+
+
+# _write_runs
+
+def test_write_runs_nothing():
+    assert _write_runs({}) == []
+
+
+def test_write_runs_consecutive():
+    assert _write_runs({12: 3, 10: 1, 11: 2}) == [(10, [1, 2, 3])]
+
+
+def test_write_runs_gap():
+    assert _write_runs({10: 1, 12: 3, 13: 4}) == [(10, [1]), (12, [3, 4])]
+
+
+@pytest.mark.parametrize("count, lengths", [
+    (MAX_WRITE_REGISTERS, [123]),
+    (MAX_WRITE_REGISTERS + 1, [123, 1]),
+    (2 * MAX_WRITE_REGISTERS, [123, 123]),
+])
+def test_write_runs_split(count, lengths):
+    runs = _write_runs({address: address for address in range(count)})
+    assert [len(run) for _, run in runs] == lengths
+    assert [start for start, _ in runs] == [0, 123][:len(lengths)]
+    assert [value for _, run in runs for value in run] == list(range(count))
+
+
+# decode_registers
+
+@pytest.mark.parametrize("regs, dtype, wordswap, expected", [
+    ([0x3FC0, 0x0000], "float32", False, [1.5]),
+    ([0x0000, 0x3FC0], "float32", True, [1.5]),
+    ([0x3FC0, 0x0000, 0xC020, 0x0000], "float32", False, [1.5, -2.5]),
+    ([0xFFFF, 0xFFFE], "int32", False, [-2]),
+    ([0x5678, 0x1234], "uint32", True, [0x12345678]),
+    ([0x3FF8, 0, 0, 0], "float64", False, [1.5]),
+    ([0, 0, 0, 0x3FF8], "float64", True, [1.5]),
+    ([0xFFFF, 0x0001], "int16", False, [-1, 1]),
+    ([0xFFFF, 0x0001], "int16", True, [-1, 1]),
+])
+def test_decode_registers(regs, dtype, wordswap, expected):
+    np.testing.assert_array_equal(decode_registers(regs, dtype, wordswap), expected)
+
+
+def test_decode_registers_empty():
+    assert decode_registers([], "float32").size == 0
+
+
+def test_decode_registers_partial_value():
+    with pytest.raises(ValueError):
+        decode_registers([0x3FC0, 0x0000, 0x3FC0], "float32")